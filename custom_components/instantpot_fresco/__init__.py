@@ -1,5 +1,6 @@
 from __future__ import annotations
 import voluptuous as vol
+import functools
 import logging
 from datetime import timedelta
 
@@ -16,7 +17,12 @@ from .const import (
     DOMAIN,
     CONF_DEVICE_ID, CONF_MODULE_IDX, CONF_MODEL_ID,
     CONF_USERNAME, CONF_PASSWORD, CONF_REGION,
-    PRESSURE_MAP, VENT_MAP, CLIENT_ID, CONF_CLIENT_ID,
+    PRESET_MAP, PRESSURE_MAP, VENT_MAP, CLIENT_ID, CONF_CLIENT_ID,
+    COMMAND_START, COMMAND_UPDATE, COMMAND_CANCEL,
+    CAPABILITY_KEEP_WARM, CAPABILITY_PRESSURE_COOK,
+    SETTING_TEMPERATURE, SETTING_TIME, SETTING_PRESSURE,
+    SETTING_VENTING, SETTING_VENTING_TIME, SETTING_NUTRIBOOST,
+    UNIT_CELSIUS, UNIT_SECOND,
 )
 from .api import KitchenOSClient, CognitoTokenManager
 
@@ -38,15 +44,54 @@ SERVICE_START_PRESSURE_COOK = "start_pressure_cook"
 SERVICE_UPDATE_PRESSURE_COOK = "update_pressure_cook"
 
 
+def _numeric_setting(setting_id: str, value, unit_id: str) -> dict:
+    return {
+        "reference_setting_id": setting_id,
+        "value": {"type": "numeric", "value": int(value), "reference_unit_id": unit_id, "reference_value_id": None}
+    }
+
+
+def _nominal_setting(setting_id: str, value_id: str) -> dict:
+    return {
+        "reference_setting_id": setting_id,
+        "value": {"type": "nominal", "reference_value_id": value_id, "reference_unit_id": None}
+    }
+
+
+def _boolean_setting(setting_id: str, value: bool) -> dict:
+    return {
+        "reference_setting_id": setting_id,
+        "value": {"type": "boolean", "value": value, "reference_unit_id": None, "reference_value_id": None}
+    }
+
+
+# Settings with a fixed set of values are built once here and shared between
+# calls; payloads are only ever serialized, never mutated.
+_PRESET_SETTINGS = {k: _nominal_setting(SETTING_TEMPERATURE, v) for k, v in PRESET_MAP.items()}
+_PRESSURE_SETTINGS = {k: _nominal_setting(SETTING_PRESSURE, v) for k, v in PRESSURE_MAP.items()}
+_VENT_SETTINGS = {k: _nominal_setting(SETTING_VENTING, v) for k, v in VENT_MAP.items()}
+_NUTRIBOOST_SETTINGS = {v: _boolean_setting(SETTING_NUTRIBOOST, v) for v in (True, False)}
+
+
 def _duration_to_seconds(v) -> int | None:
     """Support HA duration selector (dict) or string or seconds int."""
     if v is None:
         return None
-    # HA's duration selector typically yields dict {hours, minutes, seconds}
+    # HA's duration selector typically yields dict {hours, minutes, seconds};
+    # fold it into a hashable tuple so it can share the parse cache
     if isinstance(v, dict):
-        h = int(v.get("hours", 0) or 0)
-        m = int(v.get("minutes", 0) or 0)
-        s = int(v.get("seconds", 0) or 0)
+        v = (v.get("hours", 0), v.get("minutes", 0), v.get("seconds", 0))
+    try:
+        return _parse_duration(v)
+    except TypeError:
+        # unhashable input (lists, nested dicts) is not a duration
+        return None
+
+@functools.lru_cache(maxsize=128)
+def _parse_duration(v) -> int | None:
+    """Cached worker for _duration_to_seconds; takes hashable input only."""
+    if isinstance(v, tuple):
+        h, m, s = (int(x or 0) for x in v)
         return int(timedelta(hours=h, minutes=m, seconds=s).total_seconds())
     if isinstance(v, (int, float)):
         return int(v)
@@ -64,40 +109,142 @@ def _duration_to_seconds(v) -> int | None:
 
 SCHEMA_CANCEL = vol.Schema({}, extra=vol.ALLOW_EXTRA)
 
+_PRESET_KEYS = frozenset(PRESET_MAP)
+_PRESSURE_KEYS = frozenset(PRESSURE_MAP)
+_VENT_KEYS = frozenset(VENT_MAP)
+
+# Shared validator instances for the *_seconds fields
+_SECONDS_UP_TO_1H = vol.All(int, vol.Range(min=1, max=3600))
+_SECONDS_UP_TO_5H = vol.All(int, vol.Range(min=1, max=18000))
+_SECONDS_UP_TO_1D = vol.All(int, vol.Range(min=1, max=86400))
+
+# Voluptuous compiles a schema when it is constructed, so build each distinct
+# schema once at import and share it between the start/update services.
 SCHEMA_START_KEEP_WARM = vol.Schema({
     vol.Optional("temp_c"): vol.All(int, vol.Range(min=25, max=95)),
-    vol.Optional("preset"): vol.In(["Low", "High"]),
+    vol.Optional("preset"): vol.In(_PRESET_KEYS),
     vol.Optional("duration"): object,
-    vol.Optional("duration_seconds"): vol.All(int, vol.Range(min=1, max=24*60*60)),
+    vol.Optional("duration_seconds"): _SECONDS_UP_TO_1D,
 }, extra=vol.ALLOW_EXTRA)
 
-SCHEMA_UPDATE_KEEP_WARM = vol.Schema({
-    vol.Optional("temp_c"): vol.All(int, vol.Range(min=25, max=95)),
-    vol.Optional("preset"): vol.In(["Low", "High"]),
-    vol.Optional("duration"): object,
-    vol.Optional("duration_seconds"): vol.All(int, vol.Range(min=1, max=24*60*60)),
-}, extra=vol.ALLOW_EXTRA)
+SCHEMA_UPDATE_KEEP_WARM = SCHEMA_START_KEEP_WARM
 
-SCHEMA_START_PRESSURE = vol.Schema({
-    vol.Optional("pressure"): vol.In(list(PRESSURE_MAP.keys())),
+_PRESSURE_FIELDS = {
+    vol.Optional("pressure"): vol.In(_PRESSURE_KEYS),
     vol.Optional("cook_time"): object,
-    vol.Optional("cook_time_seconds"): vol.All(int, vol.Range(min=1, max=5*60*60)),
-    vol.Optional("venting"): vol.In(list(VENT_MAP.keys())),
+    vol.Optional("cook_time_seconds"): _SECONDS_UP_TO_5H,
+    vol.Optional("venting"): vol.In(_VENT_KEYS),
     vol.Optional("vent_time"): object,
-    vol.Optional("vent_time_seconds"): vol.All(int, vol.Range(min=1, max=60*60)),
+    vol.Optional("vent_time_seconds"): _SECONDS_UP_TO_1H,
+}
+
+SCHEMA_START_PRESSURE = vol.Schema({
+    **_PRESSURE_FIELDS,
     vol.Optional("nutriboost", default=False): cv.boolean,
 }, extra=vol.ALLOW_EXTRA)
 
 SCHEMA_UPDATE_PRESSURE = vol.Schema({
-    vol.Optional("pressure"): vol.In(list(PRESSURE_MAP.keys())),
-    vol.Optional("cook_time"): object,
-    vol.Optional("cook_time_seconds"): vol.All(int, vol.Range(min=1, max=5*60*60)),
-    vol.Optional("venting"): vol.In(list(VENT_MAP.keys())),
-    vol.Optional("vent_time"): object,
-    vol.Optional("vent_time_seconds"): vol.All(int, vol.Range(min=1, max=60*60)),
+    **_PRESSURE_FIELDS,
     vol.Optional("nutriboost"): cv.boolean,
 }, extra=vol.ALLOW_EXTRA)
 
+def _build_start_keep_warm(data) -> dict:
+    temp_c = data.get("temp_c")
+    preset = data.get("preset")
+    dur_sec = data.get("duration_seconds") or _duration_to_seconds(data.get("duration"))
+
+    if (temp_c is None and preset is None) or (temp_c is not None and preset is not None):
+        raise HomeAssistantError("Provide either 'temp_c' OR 'preset' (not both).")
+    if not dur_sec:
+        raise HomeAssistantError("Provide a valid 'duration'.")
+
+    if temp_c is not None:
+        temp_setting = _numeric_setting(SETTING_TEMPERATURE, temp_c, UNIT_CELSIUS)
+    else:
+        temp_setting = _PRESET_SETTINGS[preset]
+    settings = [temp_setting, _numeric_setting(SETTING_TIME, dur_sec, UNIT_SECOND)]
+    return {"reference_capability_id": CAPABILITY_KEEP_WARM, "settings": settings}
+
+
+def _build_update_keep_warm(data) -> dict:
+    temp_c = data.get("temp_c")
+    preset = data.get("preset")
+    dur_sec = data.get("duration_seconds") or _duration_to_seconds(data.get("duration"))
+
+    settings = []
+    if temp_c is not None and preset is not None:
+        raise HomeAssistantError("Provide either 'temp_c' OR 'preset', not both.")
+    if temp_c is not None:
+        settings.append(_numeric_setting(SETTING_TEMPERATURE, temp_c, UNIT_CELSIUS))
+    elif preset is not None:
+        settings.append(_PRESET_SETTINGS[preset])
+    if dur_sec:
+        settings.append(_numeric_setting(SETTING_TIME, dur_sec, UNIT_SECOND))
+    if not settings:
+        raise HomeAssistantError("Provide at least one of temp_c/preset/duration.")
+    return {"reference_capability_id": CAPABILITY_KEEP_WARM, "settings": settings}
+
+
+def _build_start_pressure(data) -> dict:
+    cook_sec = data.get("cook_time_seconds") or _duration_to_seconds(data.get("cook_time"))
+    vent_sec = data.get("vent_time_seconds") or _duration_to_seconds(data.get("vent_time"))
+    pressure_setting = _PRESSURE_SETTINGS.get(data.get("pressure"))
+    venting = data.get("venting", "Natural")
+    nutriboost = bool(data.get("nutriboost", False))
+
+    if pressure_setting is None:
+        raise HomeAssistantError("Select a valid 'pressure' level.")
+    if not cook_sec:
+        raise HomeAssistantError("Provide a valid 'cook_time'.")
+
+    # exact-size tuple (serialized as a JSON array); only the optional
+    # venting time needs a second allocation
+    settings = (
+        pressure_setting,
+        _numeric_setting(SETTING_TIME, cook_sec, UNIT_SECOND),
+        _VENT_SETTINGS.get(venting, _VENT_SETTINGS["Natural"]),
+        _NUTRIBOOST_SETTINGS[nutriboost],
+    )
+    if vent_sec:
+        settings += (_numeric_setting(SETTING_VENTING_TIME, vent_sec, UNIT_SECOND),)
+
+    return {"reference_capability_id": CAPABILITY_PRESSURE_COOK, "settings": settings}
+
+
+def _build_update_pressure(data) -> dict:
+    cook_sec = data.get("cook_time_seconds") or _duration_to_seconds(data.get("cook_time"))
+    vent_sec = data.get("vent_time_seconds") or _duration_to_seconds(data.get("vent_time"))
+
+    settings = []
+    pressure_setting = _PRESSURE_SETTINGS.get(data.get("pressure"))
+    if pressure_setting is not None:
+        settings.append(pressure_setting)
+    if cook_sec:
+        settings.append(_numeric_setting(SETTING_TIME, cook_sec, UNIT_SECOND))
+    vent_setting = _VENT_SETTINGS.get(data.get("venting"))
+    if vent_setting is not None:
+        settings.append(vent_setting)
+    if vent_sec:
+        settings.append(_numeric_setting(SETTING_VENTING_TIME, vent_sec, UNIT_SECOND))
+    nutriboost = data.get("nutriboost")
+    if nutriboost is not None:
+        settings.append(_NUTRIBOOST_SETTINGS[bool(nutriboost)])
+    if not settings:
+        raise HomeAssistantError("Provide at least one setting to update.")
+
+    return {"reference_capability_id": CAPABILITY_PRESSURE_COOK, "settings": settings}
+
+
+# service -> (command, capability builder, schema); builders validate call
+# data and raise HomeAssistantError before anything is sent
+_SERVICES = {
+    SERVICE_CANCEL: (COMMAND_CANCEL, None, SCHEMA_CANCEL),
+    SERVICE_START_KEEP_WARM: (COMMAND_START, _build_start_keep_warm, SCHEMA_START_KEEP_WARM),
+    SERVICE_UPDATE_KEEP_WARM: (COMMAND_UPDATE, _build_update_keep_warm, SCHEMA_UPDATE_KEEP_WARM),
+    SERVICE_START_PRESSURE_COOK: (COMMAND_START, _build_start_pressure, SCHEMA_START_PRESSURE),
+    SERVICE_UPDATE_PRESSURE_COOK: (COMMAND_UPDATE, _build_update_pressure, SCHEMA_UPDATE_PRESSURE),
+}
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return True
 
@@ -144,158 +291,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     async def _wrap(call: ServiceCall, coro_factory):
         try:
-            result = await coro_factory()
-            _LOGGER.debug("Service %s succeeded: %s", call.service, result)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                result = await coro_factory()
+                _LOGGER.debug("Service %s succeeded: %s", call.service, result)
+            else:
+                # don't keep the response around when nothing will log it
+                await coro_factory()
+        except HomeAssistantError:
+            # already user-facing; no traceback needed
+            raise
         except Exception as e:
             _LOGGER.exception("Service %s failed", call.service)
             # Show the real cause in UI instead of “Unknown error”
             raise HomeAssistantError(str(e)) from e
 
-    async def _cancel(call: ServiceCall):
-        await _wrap(call, lambda: client.execute("kitchenos:Command:Cancel"))
-
-    async def _start_keep_warm(call: ServiceCall):
-        data = call.data
-        temp_c = data.get("temp_c")
-        preset = data.get("preset")
-        dur_sec = data.get("duration_seconds") or _duration_to_seconds(data.get("duration"))
-
-        if (temp_c is None and preset is None) or (temp_c is not None and preset is not None):
-            raise HomeAssistantError("Provide either 'temp_c' OR 'preset' (not both).")
-        if not dur_sec:
-            raise HomeAssistantError("Provide a valid 'duration'.")
-
-        settings = []
-        if temp_c is not None:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:TemperatureSetting",
-                "value": {"type": "numeric", "value": int(temp_c), "reference_unit_id": "cckg:Celsius", "reference_value_id": None}
-            })
-        else:
-            preset_id = "kitchenos:InstantBrands:TemperatureHigh" if preset == "High" else "kitchenos:InstantBrands:TemperatureLow"
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:TemperatureSetting",
-                "value": {"type": "nominal", "reference_value_id": preset_id, "reference_unit_id": None}
-            })
-        settings.append({
-            "reference_setting_id": "kitchenos:InstantBrands:TimeSetting",
-            "value": {"type": "numeric", "value": int(dur_sec), "reference_unit_id": "cckg:Second", "reference_value_id": None}
-        })
-        capability = {"reference_capability_id": "kitchenos:InstantBrands:KeepWarm", "settings": settings}
-        await _wrap(call, lambda: client.execute("kitchenos:Command:Start", capability=capability))
-
-    async def _update_keep_warm(call: ServiceCall):
-        data = call.data
-        temp_c = data.get("temp_c")
-        preset = data.get("preset")
-        dur_sec = data.get("duration_seconds") or _duration_to_seconds(data.get("duration"))
-
-        settings = []
-        if temp_c is not None and preset is not None:
-            raise HomeAssistantError("Provide either 'temp_c' OR 'preset', not both.")
-        if temp_c is not None:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:TemperatureSetting",
-                "value": {"type": "numeric", "value": int(temp_c), "reference_unit_id": "cckg:Celsius", "reference_value_id": None}
-            })
-        elif preset is not None:
-            preset_id = "kitchenos:InstantBrands:TemperatureHigh" if preset == "High" else "kitchenos:InstantBrands:TemperatureLow"
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:TemperatureSetting",
-                "value": {"type": "nominal", "reference_value_id": preset_id, "reference_unit_id": None}
-            })
-        if dur_sec:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:TimeSetting",
-                "value": {"type": "numeric", "value": int(dur_sec), "reference_unit_id": "cckg:Second", "reference_value_id": None}
-            })
-        if not settings:
-            raise HomeAssistantError("Provide at least one of temp_c/preset/duration.")
-        capability = {"reference_capability_id": "kitchenos:InstantBrands:KeepWarm", "settings": settings}
-        await _wrap(call, lambda: client.execute("kitchenos:Command:Update", capability=capability))
-
-    async def _start_pressure(call: ServiceCall):
-        data = call.data
-        cook_sec = data.get("cook_time_seconds") or _duration_to_seconds(data.get("cook_time"))
-        vent_sec = data.get("vent_time_seconds") or _duration_to_seconds(data.get("vent_time"))
-        pressure = data.get("pressure")
-        venting = data.get("venting", "Natural")
-        nutriboost = bool(data.get("nutriboost", False))
-
-        if pressure not in PRESSURE_MAP:
-            raise HomeAssistantError("Select a valid 'pressure' level.")
-        if not cook_sec:
-            raise HomeAssistantError("Provide a valid 'cook_time'.")
-
-        settings = [
-            {
-                "reference_setting_id": "kitchenos:InstantBrands:PressureSetting",
-                "value": {"type": "nominal", "reference_value_id": PRESSURE_MAP[pressure], "reference_unit_id": None}
-            },
-            {
-                "reference_setting_id": "kitchenos:InstantBrands:TimeSetting",
-                "value": {"type": "numeric", "value": int(cook_sec), "reference_unit_id": "cckg:Second", "reference_value_id": None}
-            },
-            {
-                "reference_setting_id": "kitchenos:InstantBrands:VentingSetting",
-                "value": {"type": "nominal", "reference_value_id": VENT_MAP.get(venting, VENT_MAP["Natural"]), "reference_unit_id": None}
-            },
-            {
-                "reference_setting_id": "kitchenos:InstantBrands:NutriBoostSetting",
-                "value": {"type": "boolean", "value": nutriboost, "reference_unit_id": None, "reference_value_id": None}
-            }
-        ]
-        if vent_sec:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:VentingTimeSetting",
-                "value": {"type": "numeric", "value": int(vent_sec), "reference_unit_id": "cckg:Second", "reference_value_id": None}
-            })
-
-        capability = {"reference_capability_id": "kitchenos:InstantBrands:PressureCook", "settings": settings}
-        await _wrap(call, lambda: client.execute("kitchenos:Command:Start", capability=capability))
-
-    async def _update_pressure(call: ServiceCall):
-        data = call.data
-        cook_sec = data.get("cook_time_seconds") or _duration_to_seconds(data.get("cook_time"))
-        vent_sec = data.get("vent_time_seconds") or _duration_to_seconds(data.get("vent_time"))
-
-        settings = []
-        if "pressure" in data and data["pressure"] in PRESSURE_MAP:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:PressureSetting",
-                "value": {"type": "nominal", "reference_value_id": PRESSURE_MAP[data["pressure"]], "reference_unit_id": None}
-            })
-        if cook_sec:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:TimeSetting",
-                "value": {"type": "numeric", "value": int(cook_sec), "reference_unit_id": "cckg:Second", "reference_value_id": None}
-            })
-        if "venting" in data and data["venting"] in VENT_MAP:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:VentingSetting",
-                "value": {"type": "nominal", "reference_value_id": VENT_MAP[data["venting"]], "reference_unit_id": None}
-            })
-        if vent_sec:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:VentingTimeSetting",
-                "value": {"type": "numeric", "value": int(vent_sec), "reference_unit_id": "cckg:Second", "reference_value_id": None}
-            })
-        if "nutriboost" in data:
-            settings.append({
-                "reference_setting_id": "kitchenos:InstantBrands:NutriBoostSetting",
-                "value": {"type": "boolean", "value": bool(data["nutriboost"]), "reference_unit_id": None, "reference_value_id": None}
-            })
-        if not settings:
-            raise HomeAssistantError("Provide at least one setting to update.")
-
-        capability = {"reference_capability_id": "kitchenos:InstantBrands:PressureCook", "settings": settings}
-        await _wrap(call, lambda: client.execute("kitchenos:Command:Update", capability=capability))
-
-    hass.services.async_register(DOMAIN, SERVICE_CANCEL, _cancel, schema=SCHEMA_CANCEL)
-    hass.services.async_register(DOMAIN, SERVICE_START_KEEP_WARM, _start_keep_warm, schema=SCHEMA_START_KEEP_WARM)
-    hass.services.async_register(DOMAIN, SERVICE_UPDATE_KEEP_WARM, _update_keep_warm, schema=SCHEMA_UPDATE_KEEP_WARM)
-    hass.services.async_register(DOMAIN, SERVICE_START_PRESSURE_COOK, _start_pressure, schema=SCHEMA_START_PRESSURE)
-    hass.services.async_register(DOMAIN, SERVICE_UPDATE_PRESSURE_COOK, _update_pressure, schema=SCHEMA_UPDATE_PRESSURE)
+    async def _dispatch(call: ServiceCall):
+        command, build, _schema = _SERVICES[call.service]
+        # validate outside _wrap so bad input raises directly, without a logged traceback
+        capability = build(call.data) if build else None
+        await _wrap(call, lambda: client.execute(command, capability=capability))
+
+    for service, (_command, _build, schema) in _SERVICES.items():
+        hass.services.async_register(DOMAIN, service, _dispatch, schema=schema)
 
     # forward platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
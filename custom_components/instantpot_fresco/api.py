@@ -1,20 +1,55 @@
 from __future__ import annotations
 import json
-from typing import Any, Literal, Optional
+from typing import Any, Callable, Dict, Literal, Optional
 import aiohttp
 import asyncio
+from collections import OrderedDict
+import functools
 import logging
+from multidict import CIMultiDict, CIMultiDictProxy
 from time import monotonic
-from typing import Callable, Dict
-import time
-import json
-import logging
 
+from .const import BASE_API, NOTIFICATIONS_WS
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # orjson ships with Home Assistant; stdlib keeps the module usable without it
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
 
-from .const import BASE_API
+    _json_loads = json.loads
 
 _LOGGER = logging.getLogger(__name__)
 
+# Static request headers, kept in aiohttp's native case-insensitive container
+# so requests merge them without converting a plain dict first.
+_GET_HEADERS = CIMultiDictProxy(CIMultiDict({
+    "Accept": "application/x.default+json;version=2",
+}))
+_POST_HEADERS = CIMultiDictProxy(CIMultiDict({
+    "Content-Type": "application/json",
+    "Accept": "*/*",
+    "User-Agent": "Instantbrands/20749 CFNetwork/3826.600.41 Darwin/24.6.0",
+}))
+
+
+def _with_auth(base: CIMultiDictProxy, token: str) -> CIMultiDictProxy:
+    headers = CIMultiDict(base)
+    headers["Authorization"] = f"Bearer {token}"
+    return CIMultiDictProxy(headers)
+
+
+_USER_URL = f"{BASE_API}/user/"
+# ClientTimeout is immutable, so one instance is shared by every request
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
+_OK_STATUSES = frozenset((200, 201, 202, 204))
+_AUTH_STATUSES = frozenset((401, 403))
+
+# serialized as [] for commands without composite capabilities
+_NO_COMPOSITES: tuple = ()
+_BARE_BODY_SUFFIX = b',"composite_capabilities":[]}'
+
 class CognitoAuthError(RuntimeError):
     pass
 
@@ -25,22 +60,38 @@ class CognitoTokenManager:
       - REFRESH_TOKEN_AUTH using RefreshToken
       - Proactive refresh a little before AccessToken expiry
     """
+
+    __slots__ = (
+        "_session", "_username", "_password", "_client_id", "_region",
+        "_cognito_url", "_refresh_body_prefix",
+        "_access_token", "_id_token", "_refresh_token", "_expires_at", "_generation", "_lock",
+    )
+
     def __init__(self, session: aiohttp.ClientSession, *, username: str, password: str, client_id: str, region: str):
         self._session = session
         self._username = username
         self._password = password
         self._client_id = client_id
         self._region = region
+        self._cognito_url = f"https://cognito-idp.{region}.amazonaws.com/"
+        self._refresh_body_prefix = (
+            b'{"ClientId":' + _json_dumps(client_id)
+            + b',"AuthFlow":"REFRESH_TOKEN_AUTH","AuthParameters":{"REFRESH_TOKEN":'
+        )
 
         self._access_token: Optional[str] = None
         self._id_token: Optional[str] = None
         self._refresh_token: Optional[str] = None
         self._expires_at: float = 0.0  # monotonic() timestamp when access token expires
+        self._generation = 0  # bumped on every successful login/refresh
         self._lock = asyncio.Lock()
 
     # ----------------- Public getters -----------------
     async def get_access_token(self) -> str:
         """Return a valid (non-expired) AccessToken, refreshing if needed."""
+        # fast path: reading the attributes needs no lock, only refreshing does
+        if self._is_fresh():
+            return self._access_token
         async with self._lock:
             await self._ensure_fresh_locked()
             if not self._access_token:
@@ -49,15 +100,19 @@ class CognitoTokenManager:
 
     async def get_id_token(self) -> Optional[str]:
         """Return the latest IdToken (may be None on some flows)."""
+        if self._is_fresh():
+            return self._id_token
         async with self._lock:
             await self._ensure_fresh_locked()
             return self._id_token
 
     # ----------------- Core flows -----------------
-    async def _ensure_fresh_locked(self):
-        now = monotonic()
+    def _is_fresh(self) -> bool:
         # refresh 90 seconds before expiry as a safety margin
-        if self._access_token and now < (self._expires_at - 90):
+        return bool(self._access_token) and monotonic() < (self._expires_at - 90)
+
+    async def _ensure_fresh_locked(self):
+        if self._is_fresh():
             return  # still fresh
 
         if self._refresh_token:
@@ -69,14 +124,29 @@ class CognitoTokenManager:
 
         await self._login_locked()
 
-    async def login(self) -> None:
-        """Public login (outside lock) for places like config_flow."""
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every successful login/refresh."""
+        return self._generation
+
+    async def login(self, seen_generation: int | None = None) -> None:
+        """Public login (outside lock) for places like config_flow.
+
+        Concurrent callers are coalesced: if tokens newer than
+        ``seen_generation`` (by default, the generation at entry) exist by the
+        time the lock is held, they are reused instead of logging in again.
+        Pass the generation read before obtaining a rejected token so logins
+        that finished since then also count.
+        """
+        generation = self._generation if seen_generation is None else seen_generation
         async with self._lock:
+            if self._generation != generation and self._access_token:
+                return
             await self._login_locked()
 
     async def _login_locked(self) -> None:
         """USER_PASSWORD_AUTH to get Access/Id/Refresh tokens."""
-        url = f"https://cognito-idp.{self._region}.amazonaws.com/"
+        url = self._cognito_url
         headers = {
             "Content-Type": "application/x-amz-json-1.1",
             "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
@@ -93,17 +163,19 @@ class CognitoTokenManager:
             }
         }
         _LOGGER.debug("Cognito login POST %s", url)
-        async with self._session.post(url, headers=headers, data=json.dumps(body)) as resp:
-            text = await resp.text()
+        async with self._session.post(url, headers=headers, data=_json_dumps(body)) as resp:
+            raw = await resp.read()
             if resp.status != 200:
-                raise CognitoAuthError(f"Cognito login failed: {resp.status} {resp.reason} – {text[:500]}")
-        self._parse_auth_result(text, source="login")
+                raise CognitoAuthError(
+                    f"Cognito login failed: {resp.status} {resp.reason} – {raw[:500].decode(errors='replace')}"
+                )
+        self._parse_auth_result(raw, source="login")
 
     async def _refresh_locked(self) -> None:
         """REFRESH_TOKEN_AUTH to get new Access/Id tokens using stored RefreshToken."""
         if not self._refresh_token:
             raise CognitoAuthError("No RefreshToken available to refresh.")
-        url = f"https://cognito-idp.{self._region}.amazonaws.com/"
+        url = self._cognito_url
         headers = {
             "Content-Type": "application/x-amz-json-1.1",
             "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
@@ -111,23 +183,20 @@ class CognitoTokenManager:
             "Accept": "*/*",
             "User-Agent": "Instantbrands/20749 CFNetwork/3826.600.41 Darwin/24.6.0",
         }
-        body = {
-            "ClientId": self._client_id,
-            "AuthFlow": "REFRESH_TOKEN_AUTH",
-            "AuthParameters": {
-                "REFRESH_TOKEN": self._refresh_token
-            }
-        }
+        # only the refresh token varies; splice it into the pre-serialized body
+        body = self._refresh_body_prefix + _json_dumps(self._refresh_token) + b"}}"
         _LOGGER.debug("Cognito refresh POST %s", url)
-        async with self._session.post(url, headers=headers, data=json.dumps(body)) as resp:
-            text = await resp.text()
+        async with self._session.post(url, headers=headers, data=body) as resp:
+            raw = await resp.read()
             if resp.status != 200:
-                raise CognitoAuthError(f"Cognito refresh failed: {resp.status} {resp.reason} – {text[:500]}")
-        self._parse_auth_result(text, source="refresh")
+                raise CognitoAuthError(
+                    f"Cognito refresh failed: {resp.status} {resp.reason} – {raw[:500].decode(errors='replace')}"
+                )
+        self._parse_auth_result(raw, source="refresh")
 
-    def _parse_auth_result(self, text: str, *, source: str) -> None:
+    def _parse_auth_result(self, raw: bytes, *, source: str) -> None:
         try:
-            data = json.loads(text)
+            data = _json_loads(raw)
             ar = data["AuthenticationResult"]
             access = ar.get("AccessToken")
             idt = ar.get("IdToken")
@@ -139,71 +208,91 @@ class CognitoTokenManager:
             self._id_token = idt
             self._refresh_token = refresh
             self._expires_at = monotonic() + int(expires_in)
+            self._generation += 1
 
             _LOGGER.debug(
                 "Cognito %s OK; access=%s id=%s refresh=%s expires_in=%ss",
                 source, bool(access), bool(idt), bool(refresh), expires_in
             )
         except Exception as e:
-            raise CognitoAuthError(f"Cognito {source} parse error: {e}; body={text[:500]}")
+            raise CognitoAuthError(
+                f"Cognito {source} parse error: {e}; body={raw[:500].decode(errors='replace')}"
+            )
+
+
+async def fetch_user_profile(session: aiohttp.ClientSession, token_mgr: CognitoTokenManager) -> dict:
+    """Fetch /user/ (device discovery); needs only a logged-in token manager."""
+    url = _USER_URL
+    access = await token_mgr.get_access_token()
+
+    async def _once(tok: str) -> tuple[int, str, bytes]:
+        headers = _with_auth(_GET_HEADERS, tok)
+        async with session.get(url, headers=headers, timeout=_REQUEST_TIMEOUT) as resp:
+            # keep the body as bytes; it is parsed without a str decode
+            body = await resp.read()
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "GET %s -> %s %s\n%s",
+                    url, resp.status, resp.reason, body[:1000].decode(errors="replace"),
+                )
+            return resp.status, resp.reason, body
+
+    _LOGGER.debug("GET %s with AccessToken", url)
+    status, reason, body = await _once(access)
+    if status in _AUTH_STATUSES:
+        # Try with IdToken (some backends prefer it)
+        idt = await token_mgr.get_id_token()
+        if idt:
+            _LOGGER.debug("GET /user/ retrying with IdToken")
+            status, reason, body = await _once(idt)
+
+    if status >= 400:
+        raise RuntimeError(f"/user/ {status} {reason}: {body[:500].decode(errors='replace')}")
 
+    try:
+        return _json_loads(body)
+    except Exception:
+        return {}
 
 
 class KitchenOSClient:
-    """Async API client using CognitoTokenManager."""
+    """
+    Async API client using CognitoTokenManager.
+
+    Pass the same aiohttp session used by the token manager and the
+    NotificationsManager (in Home Assistant, the shared clientsession) so
+    Cognito and API requests reuse pooled keep-alive connections; the session
+    is owned by the caller and is never closed here.
+    """
+
+    __slots__ = (
+        "_session", "_tm", "_device_id", "_module_idx", "_body_template", "_bare_body_prefix",
+        "_exec_url", "_post_execute", "_post_headers",
+    )
 
     def __init__(self, session: aiohttp.ClientSession, token_mgr: CognitoTokenManager, device_id: str, module_idx: int = 0):
         self._session = session
         self._tm = token_mgr
         self._device_id = device_id
         self._module_idx = module_idx
-
-    async def _auth_headers_get(self, token: str) -> dict:
-        return {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/x.default+json;version=2",
-        }
-
-    async def _auth_headers_post(self, token: str) -> dict:
-        return {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Accept": "*/*",
-            "User-Agent": "Instantbrands/20749 CFNetwork/3826.600.41 Darwin/24.6.0",
-        }
+        self._post_headers: tuple[str, CIMultiDictProxy] | None = None
+        self._body_template = {"appliance_module_idx": module_idx, "device_id": device_id}
+        self._bare_body_prefix = _json_dumps(self._body_template)[:-1] + b',"command":'
+        # every command goes to the same endpoint; bind it to the session once
+        self._exec_url = f"{BASE_API}/cooking/execute"
+        self._post_execute = functools.partial(session.post, self._exec_url, timeout=_REQUEST_TIMEOUT)
+
+    # Headers only change when the token does, so the last set built is
+    # reused until the next refresh.
+    def _auth_headers_post(self, token: str) -> CIMultiDictProxy:
+        cached = self._post_headers
+        if cached is None or cached[0] != token:
+            cached = self._post_headers = (token, _with_auth(_POST_HEADERS, token))
+        return cached[1]
 
     # ---------- User profile (device discovery) ----------
     async def get_user_profile(self) -> dict:
-        url = f"{BASE_API}/user/"
-        access = await self._tm.get_access_token()
-
-        async def _once(tok: str) -> tuple[int, str, str]:
-            headers = await self._auth_headers_get(tok)
-            _LOGGER.debug("GET %s with AccessToken", url)
-            async with self._session.get(url, headers=headers) as resp:
-                text = await resp.text()
-                _LOGGER.debug("GET %s -> %s %s\n%s", url, resp.status, resp.reason, text[:1000])
-                return resp.status, resp.reason, text
-
-        status, reason, text = await _once(access)
-        if status in (401, 403):
-            # Try with IdToken (some backends prefer it)
-            idt = await self._tm.get_id_token()
-            if idt:
-                _LOGGER.debug("GET /user/ retrying with IdToken")
-                headers = await self._auth_headers_get(idt)
-                async with self._session.get(url, headers=headers) as resp:
-                    text = await resp.text()
-                    _LOGGER.debug("GET %s (IdToken) -> %s %s\n%s", url, resp.status, resp.reason, text[:1000])
-                    status, reason = resp.status, resp.reason
-
-        if status >= 400:
-            raise RuntimeError(f"/user/ {status} {reason}: {text[:500]}")
-
-        try:
-            return json.loads(text)
-        except Exception:
-            return {}
+        return await fetch_user_profile(self._session, self._tm)
 
     # ---------- Execute (commands) ----------
     async def execute(
@@ -212,61 +301,56 @@ class KitchenOSClient:
         capability: dict | None = None,
         composite_capabilities: list[dict] | None = None,
     ) -> dict:
-        url = f"{BASE_API}/cooking/execute"
-        body: dict[str, Any] = {
-            "appliance_module_idx": self._module_idx,
-            "device_id": self._device_id,
-            "command": command,
-            "composite_capabilities": composite_capabilities or [],
-        }
-        if capability is not None:
-            body["capability"] = capability
-
-        payload = json.dumps(body, separators=(",", ":"))
-        _LOGGER.debug("POST %s\n%s", url, payload)
+        url = self._exec_url
+        if capability is None and not composite_capabilities:
+            # bare commands (e.g. Cancel) only differ by the command id
+            payload = self._bare_body_prefix + _json_dumps(command) + _BARE_BODY_SUFFIX
+        else:
+            body: dict[str, Any] = {
+                **self._body_template,
+                "command": command,
+                "composite_capabilities": composite_capabilities or _NO_COMPOSITES,
+            }
+            if capability is not None:
+                body["capability"] = capability
+            # compact bytes, which aiohttp sends as-is
+            payload = _json_dumps(body)
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("POST %s\n%s", url, payload.decode())
 
         async def _once(token: str) -> tuple[int, str, str]:
-            headers = await self._auth_headers_post(token)
-            async with self._session.post(url, headers=headers, data=payload) as resp:
-                text = await resp.text()
-                _LOGGER.debug("POST %s -> %s %s\n%s", url, resp.status, resp.reason, text[:2000])
+            headers = self._auth_headers_post(token)
+            async with self._post_execute(headers=headers, data=payload) as resp:
+                # 204 No Content has nothing to read or decode
+                text = "" if resp.status == 204 else await resp.text()
+                if debug:
+                    _LOGGER.debug("POST %s -> %s %s\n%s", url, resp.status, resp.reason, text[:2000])
                 return resp.status, resp.reason, text
 
-        # Try ID token first (mobile app does this), then Access token, then refresh+retry
-        idt = await self._tm.get_id_token()
-        if idt:
-            status, reason, text = await _once(idt)
-            if status in (200, 201, 202, 204):
+        # Try ID token first (mobile app does this), then Access token; on an auth
+        # error refresh (will use REFRESH_TOKEN) and retry ID→Access once more
+        tm = self._tm
+        # tokens from any login that completes after this point are newer than
+        # the ones about to be tried, so a rejection can reuse them
+        generation = tm.generation
+        attempts = (tm.get_id_token, tm.get_access_token, tm.get_id_token, tm.get_access_token)
+        status, reason, text = 0, "", ""
+        for attempt, get_token in enumerate(attempts):
+            if attempt == 2:
+                _LOGGER.warning("%s from /cooking/execute; refreshing tokens then retrying", status)
+                await tm.login(seen_generation=generation)  # refresh/login path
+            token = await get_token()
+            if not token:
+                continue
+            status, reason, text = await _once(token)
+            if status in _OK_STATUSES:
                 try:
-                    return json.loads(text) if text else {"status": status}
+                    return _json_loads(text) if text else {"status": status}
                 except Exception:
                     return {"status": status, "text": text[:2000]}
-            if status not in (401, 403):
-                raise RuntimeError(f"/cooking/execute {status} {reason}: {text[:500]}")
-
-        # fall back to AccessToken
-        access = await self._tm.get_access_token()
-        status, reason, text = await _once(access)
-        if status in (200, 201, 202, 204):
-            try:
-                return json.loads(text) if text else {"status": status}
-            except Exception:
-                return {"status": status, "text": text[:2000]}
-
-        # auth error → refresh (will use REFRESH_TOKEN) then retry ID→Access
-        if status in (401, 403):
-            _LOGGER.warning("%s from /cooking/execute; refreshing tokens then retrying", status)
-            await self._tm.login()  # refresh/login path
-            idt = await self._tm.get_id_token()
-            if idt:
-                status, reason, text = await _once(idt)
-                if status in (200, 201, 202, 204):
-                    try:
-                        return json.loads(text) if text else {"status": status}
-                    except Exception:
-                        return {"status": status, "text": text[:2000]}
-            access = await self._tm.get_access_token()
-            status, reason, text = await _once(access)
+            if status not in _AUTH_STATUSES:
+                break
 
         # final error
         raise RuntimeError(f"/cooking/execute {status} {reason}: {text[:500]}")
@@ -282,7 +366,10 @@ class KitchenOSClient:
         self._tm = None
         _LOGGER.debug("KitchenOSClient closed")
 
-_WS_LOGGER = logging.getLogger(__name__)
+_WS_HEADERS = {"Origin": "https://app.fresco-kitchenos.com"}
+_MSG_CACHE_MAX = 64
+# handed to listeners for devices with no state yet; never mutated
+_EMPTY_STATE: dict = {}
 
 class NotificationsManager:
     """
@@ -291,27 +378,50 @@ class NotificationsManager:
     Auto-reconnects with backoff and refreshes tokens via CognitoTokenManager.
     """
 
+    __slots__ = (
+        "_session", "_tm", "_listeners", "_states", "_availability",
+        "_msg_cache", "_ws_handlers", "_task", "_stop",
+        "_token_generation", "_reauth",
+    )
+
     def __init__(self, session: aiohttp.ClientSession, token_mgr: CognitoTokenManager):
         self._session = session
         self._tm = token_mgr
-        self._listeners: Dict[str, set[Callable[[dict], None]]] = {}
+        # immutable per-device snapshots, replaced on add/remove, so dispatch
+        # can iterate them without copying
+        self._listeners: Dict[str, tuple[Callable[[dict], None], ...]] = {}
         self._states: Dict[str, dict] = {}
         self._availability: Dict[str, bool] = {}
+        # raw frame -> (device_id, normalized state), least recently used first
+        self._msg_cache: OrderedDict[str, tuple[str, dict]] = OrderedDict()
+        self._ws_handlers = {
+            aiohttp.WSMsgType.TEXT: self._handle_message,
+            aiohttp.WSMsgType.ERROR: self._handle_error,
+        }
         self._task: asyncio.Task | None = None
         self._stop = asyncio.Event()
+        # generation of the IdToken the socket connected with, and whether the
+        # edge rejected it (handshake 401/403 or a "Forbidden" frame)
+        self._token_generation = 0
+        self._reauth = False
 
     # ---- public API used by sensor entities ----
     def add_listener(self, device_id: str, cb: Callable[[dict], None]) -> Callable[[], None]:
-        self._listeners.setdefault(device_id, set()).add(cb)
+        listeners = self._listeners.get(device_id, ())
+        if cb not in listeners:
+            self._listeners[device_id] = listeners + (cb,)
         # push last known immediately if we have it
         if device_id in self._states:
             try:
                 cb(self._states[device_id])
             except Exception:
                 pass
-        def _remove():
-            self._listeners.get(device_id, set()).discard(cb)
-        return _remove
+        return functools.partial(self._remove_listener, device_id, cb)
+
+    def _remove_listener(self, device_id: str, cb: Callable[[dict], None]) -> None:
+        listeners = self._listeners.get(device_id, ())
+        if cb in listeners:
+            self._listeners[device_id] = tuple(c for c in listeners if c != cb)
 
     def get_state(self, device_id: str) -> dict | None:
         return self._states.get(device_id)
@@ -346,82 +456,132 @@ class NotificationsManager:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                _WS_LOGGER.warning("Notifications WS error: %s", e)
-                await asyncio.sleep(backoff)
+                _LOGGER.warning("Notifications WS error: %s", e)
+                # wait out the backoff, but wake immediately if stop() is called
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=backoff)
+                    break
+                except asyncio.TimeoutError:
+                    pass
                 backoff = min(backoff * 2, 30)
 
-        _WS_LOGGER.debug("Notifications loop stopped")
+        _LOGGER.debug("Notifications loop stopped")
 
     async def _pump(self):
-        # ensure fresh tokens; prefer IdToken
-        await self._tm.login()  # will refresh if needed
-        idt = await self._tm.get_id_token()
+        tm = self._tm
+        if self._reauth:
+            # the edge rejected a token that is still fresh locally, so the
+            # cheap path below would keep reusing it; log in again first
+            await tm.login(seen_generation=self._token_generation)
+            self._reauth = False
+        # prefer IdToken; this refreshes (or logs in) only when the token is stale
+        idt = await tm.get_id_token()
         if not idt:
             raise RuntimeError("No IdToken available for notifications")
+        self._token_generation = tm.generation
 
-        url = f"wss://notifications.fresco-kitchenos.com/?idToken={idt}"
-        headers = {"Origin": "https://app.fresco-kitchenos.com"}
-
-        _WS_LOGGER.debug("Connecting WS: %s", url)
-        async with self._session.ws_connect(url, headers=headers, heartbeat=30) as ws:
-            _WS_LOGGER.info("Notifications connected")
-            # mark everything available while connected
-            for dev in list(self._availability.keys()):
-                self._availability[dev] = True
-
-            async for msg in ws:
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    self._handle_message(msg.data)
-                elif msg.type == aiohttp.WSMsgType.ERROR:
-                    raise RuntimeError(f"WS error frame: {ws.exception()}")
-                elif msg.type == aiohttp.WSMsgType.CLOSED:
-                    break
+        # the service only accepts the token as a query parameter
+        url = f"{NOTIFICATIONS_WS}?idToken={idt}"
 
-        _WS_LOGGER.info("Notifications disconnected")
-        # mark all known devices unavailable on disconnect; entities will show unavailable
-        for dev in list(self._availability.keys()):
-            self._availability[dev] = False
-            self._dispatch(dev)
+        _LOGGER.debug("Connecting WS: %s", NOTIFICATIONS_WS)  # url carries the token
+        try:
+            ws = await self._session.ws_connect(url, headers=_WS_HEADERS, heartbeat=30)
+        except aiohttp.WSServerHandshakeError as e:
+            if e.status in _AUTH_STATUSES:
+                self._reauth = True
+            raise
+        async with ws:
+            _LOGGER.info("Notifications connected")
+            # mark everything available while connected and tell listeners,
+            # since entities cache their availability
+            # only values change, never keys, so the dict can be iterated directly
+            availability = self._availability
+            for dev in availability:
+                availability[dev] = True
+                self._dispatch(dev)
+
+            try:
+                handlers = self._ws_handlers
+                async for msg in ws:
+                    handler = handlers.get(msg.type)
+                    if handler is not None:
+                        handler(msg.data)
+
+                # iteration stops on close; a transport failure can leave its
+                # exception on ws without an ERROR frame being yielded
+                exc = ws.exception()
+                if exc is not None:
+                    raise RuntimeError(f"WS error frame: {exc}")
+            finally:
+                _LOGGER.info("Notifications disconnected")
+                # mark all known devices unavailable however the connection ended;
+                # entities will show unavailable until the next connect
+                for dev in availability:
+                    availability[dev] = False
+                    self._dispatch(dev)
+
+    @staticmethod
+    def _handle_error(data: BaseException):
+        # protocol errors arrive as ERROR frames without setting ws.exception();
+        # raise so _run logs them and backs off instead of reconnecting at once
+        raise RuntimeError(f"WS error frame: {data}") from data
 
     def _handle_message(self, data: str):
+        # the edge repeats identical frames often; reuse their normalized state
+        cache = self._msg_cache
+        cached = cache.get(data)
+        if cached is not None:
+            cache.move_to_end(data)
+        else:
+            cached = self._normalize_message(data)
+            if cached is None:
+                return
+            cache[data] = cached
+            if len(cache) > _MSG_CACHE_MAX:
+                cache.popitem(last=False)
+
+        # the normalized state is never mutated, so sharing it is safe
+        dev_id, state = cached
+        self._states[dev_id] = state
+        self._availability[dev_id] = True
+        self._dispatch(dev_id)
+
+    def _normalize_message(self, data: str) -> tuple[str, dict] | None:
+        """Parse a frame into (device_id, state), or None if it carries no state."""
         try:
-            obj = json.loads(data)
+            obj = _json_loads(data)
         except Exception:
-            _WS_LOGGER.debug("Non-JSON message: %s", data[:200])
-            return
+            _LOGGER.debug("Non-JSON message: %s", data[:200])
+            return None
 
         # Handle occasional "Forbidden" informational message from the edge
         if obj.get("message") == "Forbidden":
-            _WS_LOGGER.warning("Notifications returned 'Forbidden' message: %s", obj)
-            return
+            _LOGGER.warning("Notifications returned 'Forbidden' message: %s", obj)
+            self._reauth = True  # re-authenticate before the next connect
+            return None
 
         dev_id = obj.get("device_id")
         if not dev_id:
-            return
+            return None
 
         # normalize into a compact state dict we expose to sensors
-        state = {
-            "device_state": obj.get("state"),
-            "capability": None,
-        }
-        cap = (obj.get("capability") or {})
+        cap = obj.get("capability")
+        capability = None
         if cap:
-            cap_state = cap.get("state") or {}
-            state["capability"] = {
-                "id": cap_state.get("id"),
-                "name": cap_state.get("name"),
-                "text": cap_state.get("text"),
-                "progress": cap_state.get("progress"),
+            get = (cap.get("state") or _EMPTY_STATE).get
+            capability = {
+                "id": get("id"),
+                "name": get("name"),
+                "text": get("text"),
+                "progress": get("progress"),
                 "reference_capability_id": cap.get("reference_capability_id"),
             }
-
-        self._states[dev_id] = state
-        self._availability[dev_id] = True
-        self._dispatch(dev_id)
+        return dev_id, {"device_state": obj.get("state"), "capability": capability}
 
     def _dispatch(self, device_id: str):
-        for cb in list(self._listeners.get(device_id, ())):
+        state = self._states.get(device_id) or _EMPTY_STATE
+        for cb in self._listeners.get(device_id, ()):
             try:
-                cb(self._states.get(device_id) or {})
+                cb(state)
             except Exception:
                 pass
\ No newline at end of file
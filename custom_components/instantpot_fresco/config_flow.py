@@ -2,7 +2,8 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers import aiohttp_client, selector
+import homeassistant.helpers.config_validation as cv
 import logging
 
 from .const import (
@@ -11,17 +12,27 @@ from .const import (
     CONF_DEVICE_ID, CONF_MODULE_IDX, CONF_MODEL_ID,
     DEFAULT_REGION, DEFAULT_MODULE_IDX, DEFAULT_MODEL_ID, CLIENT_ID,
 )
-from .api import CognitoTokenManager, KitchenOSClient
+from .api import CognitoTokenManager, fetch_user_profile
 
 _LOGGER = logging.getLogger(__name__)
 
 # Step 1 schema: credentials (no device yet)
 STEP_CREDS_SCHEMA = vol.Schema({
-    vol.Required(CONF_USERNAME): str,
-    vol.Required(CONF_PASSWORD): str,
-    vol.Optional(CONF_REGION, default=DEFAULT_REGION): str,  # "us-east-2"
-    vol.Optional(CONF_MODULE_IDX, default=DEFAULT_MODULE_IDX): int,
-    vol.Optional(CONF_MODEL_ID, default=DEFAULT_MODEL_ID): str,
+    vol.Required(CONF_USERNAME): cv.string,
+    vol.Required(CONF_PASSWORD): cv.string,
+    vol.Optional(CONF_REGION, default=DEFAULT_REGION): cv.string,  # "us-east-2"
+    vol.Optional(CONF_MODULE_IDX, default=DEFAULT_MODULE_IDX): cv.positive_int,
+    vol.Optional(CONF_MODEL_ID, default=DEFAULT_MODEL_ID): cv.string,
+})
+
+# Options schema: current entry values are filled in as suggestions per form
+OPTIONS_SCHEMA = vol.Schema({
+    vol.Required(CONF_USERNAME): cv.string,
+    vol.Required(CONF_PASSWORD): cv.string,
+    vol.Optional(CONF_REGION, default=DEFAULT_REGION): cv.string,
+    vol.Required(CONF_DEVICE_ID): cv.string,
+    vol.Optional(CONF_MODULE_IDX, default=DEFAULT_MODULE_IDX): cv.positive_int,
+    vol.Optional(CONF_MODEL_ID, default=DEFAULT_MODEL_ID): cv.string,
 })
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -33,6 +44,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         super().__init__()
         self._creds: dict | None = None
         self._devices: list[tuple[str, str]] = []
+        self._pick_schema: vol.Schema | None = None
         self._attr_icon = "mdi:pot-steam"
 
     async def async_step_init(self, user_input=None) -> FlowResult:
@@ -59,68 +71,77 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await tm.login()
         except Exception as e:
             # Re-open same step with an auth error
-            return self.async_show_form(
-                step_id="user",
-                data_schema=STEP_CREDS_SCHEMA,
-                errors={"base": "auth_failed"},
-                description_placeholders={"error": str(e)[:120]},
-            )
+            return self._auth_error_form("auth_failed", e)
 
         # 2) Fetch /user/ to discover devices
-        client = KitchenOSClient(
-            session=session,
-            token_mgr=tm,
-            device_id="placeholder",
-            module_idx=user_input.get(CONF_MODULE_IDX, DEFAULT_MODULE_IDX),
-        )
         try:
-            profile = await client.get_user_profile()
+            profile = await fetch_user_profile(session, tm)
         except Exception as e:
             _LOGGER.exception("Fetching /user/ failed: %s", e)
-            return self.async_show_form(
-                step_id="user",
-                data_schema=STEP_CREDS_SCHEMA,
-                errors={"base": "cannot_fetch_user"},
-                description_placeholders={"error": str(e)[:120]},
-            )
+            return self._auth_error_form("cannot_fetch_user", e)
 
+        if not (raw := profile.get("devices")):
+            return self.async_abort(reason="no_devices_found")
+        if len(raw) == 1:
+            # Single device (the common case) → no picker, so no label needed
+            dev_id = raw[0].get("device_id")
+            if not dev_id:
+                return self.async_abort(reason="no_devices_found")
+            return await self._async_create_device_entry(dev_id)
+
+        # the same appliance can be listed more than once (e.g. across regions);
+        # keep the first entry so the picker shows each device once
         devices = []
-        for d in (profile.get("devices") or []):
+        seen: set[str] = set()
+        for d in raw:
             dev_id = d.get("device_id")
-            app = d.get("appliance") or {}
-            label = f'{dev_id} — {app.get("name","Appliance")} ({app.get("id","")})' if dev_id else None
-            if dev_id and label:
-                devices.append((dev_id, label))
+            if dev_id and dev_id not in seen:
+                seen.add(dev_id)
+                app = d.get("appliance") or {}
+                devices.append((dev_id, f'{dev_id} — {app.get("name","Appliance")} ({app.get("id","")})'))
 
         if not devices:
             return self.async_abort(reason="no_devices_found")
 
         if len(devices) == 1:
             # Single device → create entry immediately
-            dev_id = devices[0][0]
-            await self.async_set_unique_id(dev_id)
-            self._abort_if_unique_id_configured()
-            data = {**self._creds, CONF_DEVICE_ID: dev_id}
-            return self.async_create_entry(title=f"Instant Pot ({dev_id})", data=data)
+            return await self._async_create_device_entry(devices[0][0])
 
-        # Multiple devices → store list and go to picker step
+        # Multiple devices → store list, build the picker once and go to it
         self._devices = devices
+        self._pick_schema = vol.Schema({
+            vol.Required(CONF_DEVICE_ID): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(value=dev_id, label=label)
+                        for dev_id, label in devices
+                    ]
+                )
+            )
+        })
         return await self.async_step_pick_device()
 
+    def _auth_error_form(self, reason: str, err: Exception) -> FlowResult:
+        """Re-open the credentials step with an error and a short reason."""
+        return self.async_show_form(
+            step_id="user",
+            data_schema=STEP_CREDS_SCHEMA,
+            errors={"base": reason},
+            description_placeholders={"error": str(err)[:120]},
+        )
+
     async def async_step_pick_device(self, user_input=None) -> FlowResult:
         """Let user choose a device if multiple are found."""
         if not self._devices:
             return self.async_abort(reason="no_devices_found")
-            
-        device_map = {dev_id: label for dev_id, label in self._devices}
-        schema = vol.Schema({
-            vol.Required(CONF_DEVICE_ID): vol.In(device_map)
-        })
 
         if user_input is None:
-            return self.async_show_form(step_id="pick_device", data_schema=schema)
+            return self.async_show_form(step_id="pick_device", data_schema=self._pick_schema)
+
+        return await self._async_create_device_entry(user_input[CONF_DEVICE_ID])
 
-        dev_id = user_input[CONF_DEVICE_ID]
+    async def _async_create_device_entry(self, dev_id: str) -> FlowResult:
+        """Create the entry for the chosen device unless it is already configured."""
         await self.async_set_unique_id(dev_id)
         self._abort_if_unique_id_configured()
 
@@ -136,16 +157,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         data = self.config_entry.data
-        schema = vol.Schema({
-            vol.Required(CONF_USERNAME, default=data.get(CONF_USERNAME, "")): str,
-            vol.Required(CONF_PASSWORD, default=data.get(CONF_PASSWORD, "")): str,
-            vol.Optional(CONF_REGION, default=data.get(CONF_REGION, DEFAULT_REGION)): str,
-            vol.Required(CONF_DEVICE_ID, default=data.get(CONF_DEVICE_ID, "")): str,
-            vol.Optional(CONF_MODULE_IDX, default=data.get(CONF_MODULE_IDX, DEFAULT_MODULE_IDX)): int,
-            vol.Optional(CONF_MODEL_ID, default=data.get(CONF_MODEL_ID, DEFAULT_MODEL_ID)): str,
-        })
         if user_input is not None:
             new = {**data, **user_input}
             self.hass.config_entries.async_update_entry(self.config_entry, data=new)
             return self.async_create_entry(title="", data={})
+        # prefill the shared schema with the entry's current values
+        schema = self.add_suggested_values_to_schema(OPTIONS_SCHEMA, data)
         return self.async_show_form(step_id="init", data_schema=schema)
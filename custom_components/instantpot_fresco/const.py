@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 DOMAIN = "instantpot_fresco"
 
 # Config keys
@@ -17,16 +19,39 @@ CLIENT_ID = "5qucjsjb9i1ahnddonctmp9hba"  # Hardcoded client ID
 
 # API base
 BASE_API = "https://api.fresco-kitchenos.com"
+NOTIFICATIONS_WS = "wss://notifications.fresco-kitchenos.com/"
+
+# Command / capability / setting / unit IDs (from capture)
+COMMAND_START = "kitchenos:Command:Start"
+COMMAND_UPDATE = "kitchenos:Command:Update"
+COMMAND_CANCEL = "kitchenos:Command:Cancel"
+
+CAPABILITY_KEEP_WARM = "kitchenos:InstantBrands:KeepWarm"
+CAPABILITY_PRESSURE_COOK = "kitchenos:InstantBrands:PressureCook"
+
+SETTING_TEMPERATURE = "kitchenos:InstantBrands:TemperatureSetting"
+SETTING_TIME = "kitchenos:InstantBrands:TimeSetting"
+SETTING_PRESSURE = "kitchenos:InstantBrands:PressureSetting"
+SETTING_VENTING = "kitchenos:InstantBrands:VentingSetting"
+SETTING_VENTING_TIME = "kitchenos:InstantBrands:VentingTimeSetting"
+SETTING_NUTRIBOOST = "kitchenos:InstantBrands:NutriBoostSetting"
+
+UNIT_CELSIUS = "cckg:Celsius"
+UNIT_SECOND = "cckg:Second"
 
-# ID maps (from capture)
-PRESSURE_MAP = {
+# ID maps (from capture); read-only
+PRESET_MAP = MappingProxyType({
+    "Low":  "kitchenos:InstantBrands:TemperatureLow",
+    "High": "kitchenos:InstantBrands:TemperatureHigh",
+})
+PRESSURE_MAP = MappingProxyType({
     "Low":  "kitchenos:InstantBrands:PressureLow",
     "High": "kitchenos:InstantBrands:PressureHigh",
     "Max":  "kitchenos:InstantBrands:PressureMax",
-}
-VENT_MAP = {
+})
+VENT_MAP = MappingProxyType({
     "Natural":       "kitchenos:InstantBrands:VentingNatural",
     "Pulse":         "kitchenos:InstantBrands:VentingPulse",
     "Quick":         "kitchenos:InstantBrands:VentingQuick",
     "NaturalQuick":  "kitchenos:InstantBrands:VentingNaturalQuick",
-}
+})
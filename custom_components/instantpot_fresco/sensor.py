@@ -1,4 +1,5 @@
 from __future__ import annotations
+
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
@@ -18,6 +19,20 @@ async def async_setup_entry(hass, entry, async_add_entities):
     async_add_entities([entity])
 
 
+def _derive_native(state: dict | None) -> str | None:
+    # Map to a friendly top-level value: Ready / Preheating / Cooking / KeepWarm / Venting …
+    if not state:
+        return None
+    # Prefer capability name if present, else device_state suffix
+    cap = (state.get("capability") or {}).get("name")
+    if cap:
+        return cap
+    dev_state = state.get("device_state")
+    if isinstance(dev_state, str) and dev_state:
+        return dev_state.rpartition(":")[2]  # kitchenos:DeviceState:Running -> Running
+    return None
+
+
 class InstantPotStateSensor(SensorEntity):
     """Live state of the Instant Pot from notifications WS."""
     _attr_has_entity_name = True
@@ -29,48 +44,39 @@ class InstantPotStateSensor(SensorEntity):
         self._model_id = model_id
         self._notif = notif
         self._remove_listener = None
-        self._state = None
+        # derived once per notifier update rather than on every state read
+        self._native = None
+        self._attrs: dict = {}
 
         # unique_id makes it a stable sensor in HA
         self._attr_unique_id = f"{DOMAIN}_{device_id}_state"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
             manufacturer="Instant Brands",
-            model=self._model_id,
-            name=f"Instant Pot ({self._device_id})",
+            model=model_id,
+            name=f"Instant Pot ({device_id})",
         )
 
     @property
     def native_value(self):
-        # Map to a friendly top-level value: Ready / Preheating / Cooking / KeepWarm / Venting …
         if not self.available:
             return None
-        cap = None
-        if self._state:
-            cap = (self._state.get("capability") or {}).get("name")
-            dev_state = self._state.get("device_state")
-            # Prefer capability name if present, else device_state suffix
-            if cap:
-                return cap
-            if dev_state:
-                return dev_state.split(":")[-1]  # kitchenos:DeviceState:Running -> Running
-        return None
+        return self._native
 
     @property
     def extra_state_attributes(self):
-        return self._state or {}
-
-    @property
-    def available(self) -> bool:
-        return self._notif.is_available(self._device_id)
+        return self._attrs
 
     async def async_added_to_hass(self):
+        # availability only changes when the notifier dispatches, so it is
+        # cached here instead of being looked up on every state read
+        self._attr_available = self._notif.is_available(self._device_id)
+
         @callback
         def _on_update(state: dict):
-            self._state = state
+            self._attr_available = self._notif.is_available(self._device_id)
+            self._native = _derive_native(state)
+            self._attrs = state or {}
             self.async_write_ha_state()
 
         self._remove_listener = self._notif.add_listener(self._device_id, _on_update)